@@ -1,13 +1,37 @@
+import itertools
 import os
+import threading
+import zipfile
 from pathlib import Path
-from collections import deque
-from typing import Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical, Container
 from textual.widgets import Header, Footer, Static, Input, Label, RichLog
 from textual.binding import Binding
 from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.geometry import Size
+from textual.strip import Strip
+from textual.timer import Timer
+from textual.worker import Worker, get_current_worker
+from rich.cells import cell_len
+from rich.markup import escape
+from rich.text import Text
+
+# Optional preview dependencies, resolved once at startup
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
 
 
 # ==================== DATA STRUCTURES ====================
@@ -25,89 +49,198 @@ class TreeNode:
         child.parent = self
 
 
-class NavigationStack:
-    """Stack data structure for back/forward navigation"""
-    def __init__(self):
-        self.stack: list[Path] = []
-    
-    def push(self, path: Path):
-        self.stack.append(path)
-    
-    def pop(self) -> Optional[Path]:
-        return self.stack.pop() if self.stack else None
-    
-    def is_empty(self) -> bool:
-        return len(self.stack) == 0
+# One directory listing: parallel names / is_dir flags / sizes (-1 = no size) arrays,
+# plus the number of scanned entries that were left out and whether the scan hit its limit
+Listing = tuple[list[str], bytearray, list[int], int, bool]
 
 
-class SearchQueue:
-    """Queue data structure for BFS file searching"""
-    def __init__(self):
-        self.queue: deque[Path] = deque()
-    
-    def enqueue(self, path: Path):
-        self.queue.append(path)
-    
-    def dequeue(self) -> Optional[Path]:
-        return self.queue.popleft() if self.queue else None
-    
-    def is_empty(self) -> bool:
-        return len(self.queue) == 0
+# ==================== WIDGETS ====================
 
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
 
-# ==================== WIDGETS ====================
 
-class FileList(RichLog):
-    """Middle panel showing files"""
+def format_size(size: int) -> str:
+    """Format bytes to human readable"""
+    if size < 1024:
+        return f"{size}B"
+    # Every 10 bits of size is one unit step
+    idx = min((size.bit_length() - 1) // 10, len(_UNITS) - 1)
+    return f"{size / (1 << (idx * 10)):.1f}{_UNITS[idx]}"
+
+
+def _safe_stat(entry: os.DirEntry) -> int:
+    """Size of a regular file, or -1 for directories and unreadable entries"""
+    try:
+        return entry.stat().st_size if entry.is_file() else -1
+    except OSError:
+        return -1
+
+
+def _list_dir(path: str) -> tuple[Optional[tuple[int, int]], list[str], list[str]]:
+    """One os.walk step: ((st_dev, st_ino), dirnames, filenames), key None if unreadable"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None, [], []
+    # os.walk classifies entries from scandir data, so no extra stat per file
+    _, dirnames, filenames = next(os.walk(path), (path, [], []))
+    return (st.st_dev, st.st_ino), dirnames, filenames
+
+
+def _matching(names: list[str], query: str) -> list[str]:
+    """Names containing the (lowercase) query, ignoring case"""
+    # One lower() over the whole listing rules out most directories at once
+    if query not in "\0".join(names).lower():
+        return []
+    return [name for name in names if query in name.lower()]
+
+
+class FileList(ScrollView, can_focus=True):
+    """Middle panel showing files, only the rows in view are rendered"""
+    
+    # Shared pool so stat() calls overlap instead of running one by one
+    stat_executor = ThreadPoolExecutor(max_workers=16)
+    DIR_CACHE_SIZE = 64
+    SCAN_LIMIT = 5000  # Entries read from one directory at most
     
     def __init__(self):
-        super().__init__(highlight=True, markup=True)
+        super().__init__()
         self.current_path = Path.cwd()
-        self.files: list[Path] = []
+        # Structure of arrays: row i is names[i], is_dir[i], sizes[i]
+        self.names: list[str] = []
+        self.is_dir = bytearray()
+        self.sizes: list[int] = []  # -1 where no size is shown
+        self.more = 0  # Entries not shown because of the row or scan limit
+        self.capped = False  # Scan stopped at SCAN_LIMIT, so `more` is a lower bound
+        self.filtered = False  # Listing holds filter results
         self.selected_idx = 0
+        # Row markup is formatted once per listing, in both highlight states
+        self._normal_lines: list[str] = []
+        self._selected_lines: list[str] = []
+        self._strip_cache: dict[tuple[int, bool], Strip] = {}
+        # (path, show_hidden) -> (mtime_ns, listing), least recently used first
+        self._dir_cache: OrderedDict[tuple[Path, bool], tuple[int, Listing]] = OrderedDict()
+        self._dir_cache_lock = threading.Lock()
         self.show_hidden = False  # Toggle for hidden files
     
     def load_directory(self, path: Path):
-        self.current_path = path
-        self.selected_idx = 0
+        self.show_listing(path, self.scan_directory(path))
+    
+    def scan_directory(self, path: Path) -> Listing:
+        """List, sort and stat a directory; safe to call from a worker thread"""
+        key = (path, self.show_hidden)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        # Reuse the previous scan while the directory itself is unchanged
+        if mtime is not None:
+            with self._dir_cache_lock:
+                cached = self._dir_cache.get(key)
+                if cached is not None and cached[0] == mtime:
+                    self._dir_cache.move_to_end(key)
+                    return cached[1]
+        
         try:
-            items = list(path.iterdir())
-            # Filter hidden files if disabled
-            if not self.show_hidden:
-                items = [i for i in items if not i.name.startswith('.')]
-            items.sort(key=lambda x: (not x.is_dir(), x.name.lower()))
-            self.files = items[:300]
+            listing = self._read_directory(path)
         except (PermissionError, OSError):
-            self.files = []
+            # Not cached: fixing permissions does not change the mtime
+            return [], bytearray(), [], 0, False
+        if mtime is None:
+            return listing
+        
+        with self._dir_cache_lock:
+            self._dir_cache[key] = (mtime, listing)
+            self._dir_cache.move_to_end(key)
+            if len(self._dir_cache) > self.DIR_CACHE_SIZE:
+                self._dir_cache.popitem(last=False)
+        return listing
+    
+    def _read_directory(self, path: Path) -> Listing:
+        """Scan a directory; OSError propagates so failures are never cached"""
+        # scandir keeps the DirEntry objects, so is_dir()/stat() reuse cached data
+        # islice stops reading huge directories instead of listing all of them
+        with os.scandir(path) as it:
+            visible = (e for e in it if self.show_hidden or not e.name.startswith('.'))
+            # One extra entry tells a directory of exactly SCAN_LIMIT from a bigger one
+            items = list(itertools.islice(visible, self.SCAN_LIMIT + 1))
+        return self.build_listing(items[:self.SCAN_LIMIT], capped=len(items) > self.SCAN_LIMIT)
+    
+    def build_listing(self, entries: list[os.DirEntry], capped: bool = False) -> Listing:
+        """Sort entries (folders first), keep the first 300 and split them into arrays
+
+        capped marks entries that are only the first SCAN_LIMIT of a bigger directory.
+        """
+        names = [e.name for e in entries]
+        is_dir = bytearray(e.is_dir() for e in entries)
+        # Sort keys are built in one pass and looked up by index, no per-row lambda
+        keys = [(not d, name.lower()) for d, name in zip(is_dir, names)]
+        order = sorted(range(len(keys)), key=keys.__getitem__)[:300]
+        kept = [entries[i] for i in order]
+        # Sizes are stat'ed up front on the shared pool
+        return (
+            [names[i] for i in order],
+            bytearray(is_dir[i] for i in order),
+            list(self.stat_executor.map(_safe_stat, kept)),
+            len(entries) - len(order),
+            capped,
+        )
+    
+    def show_listing(self, path: Path, listing: Listing, filtered: bool = False):
+        """Replace the listing and redraw"""
+        self.current_path = path
+        self.names, self.is_dir, self.sizes, self.more, self.capped = listing
+        self.filtered = filtered
+        self.selected_idx = 0
         self.render_list()
     
     def render_list(self):
-        self.clear()
-        self.scroll_home(animate=False)  # Scroll to top
-        for idx, item in enumerate(self.files):
-            icon = "📁" if item.is_dir() else "📄"
+        """Format the rows of a new listing; they are drawn lazily by render_line"""
+        self._normal_lines = []
+        self._selected_lines = []
+        self._strip_cache.clear()
+        width = 0  # Widest row, so long names can be scrolled into view
+        for name, is_dir, size in zip(self.names, self.is_dir, self.sizes):
+            icon = "📁" if is_dir else "📄"
             
             # Show file size for files
-            size_str = ""
-            if item.is_file():
-                try:
-                    size = item.stat().st_size
-                    size_str = f" [{self.format_size(size)}]"
-                except:
-                    pass
+            size_str = f" [{format_size(size)}]" if size >= 0 else ""
             
-            if idx == self.selected_idx:
-                self.write(f"[black on cyan]> {icon} {item.name}{size_str}[/]")
-            else:
-                self.write(f"  {icon} {item.name}[dim]{size_str}[/]")
-    
-    def format_size(self, size: int) -> str:
-        """Format bytes to human readable"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.0f}{unit}" if size >= 10 else f"{size:.1f}{unit}"
-            size /= 1024.0
-        return f"{size:.1f}TB"
+            # Names like "weird [name].txt" must not be parsed as markup tags
+            label = escape(name)
+            self._normal_lines.append(f"  {icon} {label}[dim]{size_str}[/]")
+            self._selected_lines.append(f"[black on cyan]> {icon} {label}{size_str}[/]")
+            width = max(width, cell_len(f"  {icon} {name}{size_str}"))
+        
+        # Footer row below the entries; it can never be selected
+        if self.more:
+            count = f"{self.more}+" if self.capped else str(self.more)
+            hint = "" if self.filtered else ", filter to narrow"
+            footer = f"  ... ({count} more{hint})"
+            self._normal_lines.append(f"[dim]{footer}[/]")
+            width = max(width, cell_len(footer))
+        
+        self.virtual_size = Size(width, len(self._normal_lines))
+        self.scroll_home(animate=False)  # Scroll to top
+        self.refresh()
+    
+    def render_line(self, y: int) -> Strip:
+        """Render a single screen row, so redraws cost O(viewport) not O(files)"""
+        scroll_x, scroll_y = self.scroll_offset
+        idx = scroll_y + y
+        width = self.scrollable_content_region.width
+        if idx >= len(self._normal_lines):
+            return Strip.blank(width, self.rich_style)
+        
+        key = (idx, idx == self.selected_idx)
+        strip = self._strip_cache.get(key)
+        if strip is None:
+            markup = self._selected_lines[idx] if key[1] else self._normal_lines[idx]
+            text = Text.from_markup(markup)
+            strip = Strip(text.render(self.app.console), text.cell_len)
+            self._strip_cache[key] = strip
+        return strip.crop_extend(scroll_x, scroll_x + width, self.rich_style).apply_style(self.rich_style)
     
     def toggle_hidden(self):
         """Toggle visibility of hidden files"""
@@ -115,14 +248,29 @@ class FileList(RichLog):
         self.load_directory(self.current_path)
     
     def move_selection(self, delta: int):
-        if not self.files:
+        if not self.names:
             return
-        self.selected_idx = max(0, min(len(self.files) - 1, self.selected_idx + delta))
-        self.render_list()
+        self.select(max(0, min(len(self.names) - 1, self.selected_idx + delta)))
+    
+    def select(self, idx: int):
+        """Highlight a row and keep it inside the viewport"""
+        old_idx = self.selected_idx
+        self.selected_idx = idx
+        height = self.scrollable_content_region.height
+        top = self.scroll_offset.y
+        if idx == len(self.names) - 1:
+            self.scroll_end(animate=False)  # Brings the footer row into view too
+        elif idx < top:
+            self.scroll_to(y=idx, animate=False)
+        elif idx >= top + height:
+            self.scroll_to(y=idx - height + 1, animate=False)
+        # Only the previously and newly highlighted rows changed
+        self.refresh_line(old_idx)
+        self.refresh_line(idx)
     
     def get_selected(self) -> Optional[Path]:
-        if 0 <= self.selected_idx < len(self.files):
-            return self.files[self.selected_idx]
+        if 0 <= self.selected_idx < len(self.names):
+            return self.current_path / self.names[self.selected_idx]
         return None
 
 
@@ -142,18 +290,24 @@ class Preview(RichLog):
         
         if path.is_dir():
             try:
-                items = list(path.iterdir())
-                items.sort(key=lambda x: (not x.is_dir(), x.name.lower()))
+                # Huge directories are only sampled, not read in full
+                with os.scandir(path) as it:
+                    items = list(itertools.islice(it, 2001))
+                capped = " (first 2000 entries)" if len(items) > 2000 else ""
+                items = items[:2000]
+                items.sort(key=lambda e: (not e.is_dir(), e.name.lower()))
                 
                 # Show directory stats
                 dirs = sum(1 for i in items if i.is_dir())
                 files = len(items) - dirs
-                self.write(f"[cyan bold]Directory: {path.name}[/]")
-                self.write(f"[yellow]📁 {dirs} folders  📄 {files} files[/]\n")
+                self.write(f"[cyan bold]Directory: {escape(path.name)}[/]")
+                self.write(f"[yellow]📁 {dirs} folders  📄 {files} files{capped}[/]\n")
                 
-                for item in items[:80]:
-                    icon = "📁" if item.is_dir() else "📄"
-                    self.write(f"{icon} {item.name}")
+                # One write for the whole listing: a single measure/render pass
+                if items:
+                    self.write(self.highlighter(Text("\n".join(
+                        f"{'📁' if item.is_dir() else '📄'} {item.name}" for item in items[:80]
+                    ))))
             except (PermissionError, OSError):
                 self.write("[red]Permission denied[/]")
         else:
@@ -167,97 +321,122 @@ class Preview(RichLog):
             suffix = path.suffix.lower()
             
             # Basic info header
-            self.write(f"[cyan bold]File: {path.name}[/]")
-            self.write(f"[yellow]Size: {self.format_size(size)}[/]\n")
-            
-            # Image files
-            if suffix in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.ico', '.svg']:
-                self.write(f"[green]🖼️  Image File[/]")
-                self.write(f"Format: {suffix[1:].upper()}")
-                try:
-                    from PIL import Image
-                    img = Image.open(path)
-                    self.write(f"Dimensions: {img.width} x {img.height}")
-                    self.write(f"Mode: {img.mode}")
-                except:
-                    self.write("(Install PIL/Pillow for more details)")
-            
-            # Video files
-            elif suffix in ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v']:
-                self.write(f"[green]🎬 Video File[/]")
-                self.write(f"Format: {suffix[1:].upper()}")
-                self.write(f"Size: {self.format_size(size)}")
-            
-            # Audio files
-            elif suffix in ['.mp3', '.wav', '.flac', '.ogg', '.m4a', '.aac', '.wma']:
-                self.write(f"[green]🎵 Audio File[/]")
-                self.write(f"Format: {suffix[1:].upper()}")
-            
-            # Archive files
-            elif suffix in ['.zip', '.tar', '.gz', '.bz2', '.xz', '.7z', '.rar']:
-                self.write(f"[green]📦 Archive File[/]")
-                self.write(f"Format: {suffix[1:].upper()}")
-                if suffix == '.zip':
-                    try:
-                        import zipfile
-                        with zipfile.ZipFile(path, 'r') as zf:
-                            files = zf.namelist()
-                            self.write(f"Contains {len(files)} files:\n")
-                            for f in files[:30]:
-                                self.write(f"  - {f}")
-                            if len(files) > 30:
-                                self.write(f"  ... and {len(files) - 30} more")
-                    except:
-                        pass
-            
-            # PDF files
-            elif suffix == '.pdf':
-                self.write(f"[green]📕 PDF Document[/]")
-                try:
-                    import PyPDF2
-                    with open(path, 'rb') as f:
-                        pdf = PyPDF2.PdfReader(f)
-                        self.write(f"Pages: {len(pdf.pages)}")
-                except:
-                    self.write("(Install PyPDF2 for more details)")
-            
-            # Text/code files - show content
-            elif suffix in ['.py', '.txt', '.md', '.json', '.yaml', '.toml', '.cpp', '.c', 
-                           '.js', '.html', '.css', '.sh', '.rs', '.go', '.java', '.rb']:
-                self.write(f"[green]📝 Text/Code File[/]")
-                self.write(f"Type: {suffix[1:].upper()}\n")
-                content = path.read_text(errors='ignore')[:2000]
-                lines = content.split('\n')[:100]
-                for line in lines:
-                    self.write(line)
-                if len(content) > 2000:
-                    self.write("\n[yellow]... (truncated)[/]")
+            self.write(f"[cyan bold]File: {escape(path.name)}[/]")
+            self.write(f"[yellow]Size: {format_size(size)}[/]\n")
             
-            # Executable files
-            elif suffix in ['.exe', '.dll', '.so', '.dylib', '.app']:
-                self.write(f"[green]⚙️  Executable/Library[/]")
-                self.write(f"Type: {suffix[1:].upper()}")
+            handler = PREVIEW_HANDLERS.get(suffix, _preview_default)
+            handler(self, path, size)
             
-            # Database files
-            elif suffix in ['.db', '.sqlite', '.sqlite3']:
-                self.write(f"[green]🗄️  Database File[/]")
-                self.write(f"Type: SQLite")
-            
-            # Everything else
-            else:
-                self.write(f"[yellow]📄 Binary/Unknown File[/]")
-                self.write(f"Extension: {suffix or '(none)'}")
-                
         except Exception as e:
             self.write(f"[red]Cannot preview: {e}[/]")
-    
-    def format_size(self, size: int) -> str:
-        """Format bytes to human readable"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} PB"
+
+
+# ==================== PREVIEW HANDLERS ====================
+
+def _preview_image(preview: Preview, path: Path, size: int):
+    suffix = path.suffix.lower()
+    preview.write(f"[green]🖼️  Image File[/]")
+    preview.write(f"Format: {suffix[1:].upper()}")
+    if Image is None:
+        preview.write("(Install PIL/Pillow for more details)")
+    else:
+        try:
+            with Image.open(path) as img:
+                preview.write(f"Dimensions: {img.width} x {img.height}")
+                preview.write(f"Mode: {img.mode}")
+        except:
+            pass
+
+
+def _preview_video(preview: Preview, path: Path, size: int):
+    suffix = path.suffix.lower()
+    preview.write(f"[green]🎬 Video File[/]")
+    preview.write(f"Format: {suffix[1:].upper()}")
+    preview.write(f"Size: {format_size(size)}")
+
+
+def _preview_audio(preview: Preview, path: Path, size: int):
+    suffix = path.suffix.lower()
+    preview.write(f"[green]🎵 Audio File[/]")
+    preview.write(f"Format: {suffix[1:].upper()}")
+
+
+def _preview_archive(preview: Preview, path: Path, size: int):
+    suffix = path.suffix.lower()
+    preview.write(f"[green]📦 Archive File[/]")
+    preview.write(f"Format: {suffix[1:].upper()}")
+    if suffix == '.zip':
+        try:
+            with zipfile.ZipFile(path, 'r') as zf:
+                files = zf.namelist()
+                preview.write(f"Contains {len(files)} files:\n")
+                for f in files[:30]:
+                    preview.write(f"  - {escape(f)}")
+                if len(files) > 30:
+                    preview.write(f"  ... and {len(files) - 30} more")
+        except:
+            pass
+
+
+def _preview_pdf(preview: Preview, path: Path, size: int):
+    preview.write(f"[green]📕 PDF Document[/]")
+    if PyPDF2 is None:
+        preview.write("(Install PyPDF2 for more details)")
+    else:
+        try:
+            with open(path, 'rb') as f:
+                pdf = PyPDF2.PdfReader(f)
+                preview.write(f"Pages: {len(pdf.pages)}")
+        except:
+            pass
+
+
+def _preview_text(preview: Preview, path: Path, size: int):
+    """Text/code files - show content"""
+    suffix = path.suffix.lower()
+    preview.write(f"[green]📝 Text/Code File[/]")
+    preview.write(f"Type: {suffix[1:].upper()}\n")
+    # Read a fixed byte budget so huge files cost one small read
+    with path.open('rb') as f:
+        raw = f.read(4096)
+    content = raw.decode('utf-8', errors='ignore')
+    lines = content.split('\n')[:100]
+    # Written as one plain Text, so file contents are never parsed as markup
+    preview.write(preview.highlighter(Text("\n".join(lines))))
+    if size > len(raw):
+        preview.write("\n[yellow]... (truncated)[/]")
+
+
+def _preview_executable(preview: Preview, path: Path, size: int):
+    suffix = path.suffix.lower()
+    preview.write(f"[green]⚙️  Executable/Library[/]")
+    preview.write(f"Type: {suffix[1:].upper()}")
+
+
+def _preview_database(preview: Preview, path: Path, size: int):
+    preview.write(f"[green]🗄️  Database File[/]")
+    preview.write(f"Type: SQLite")
+
+
+def _preview_default(preview: Preview, path: Path, size: int):
+    """Everything else"""
+    suffix = path.suffix.lower()
+    preview.write(f"[yellow]📄 Binary/Unknown File[/]")
+    preview.write(f"Extension: {suffix or '(none)'}")
+
+
+# Lowercase suffix -> handler, so show_file_info dispatches with one dict lookup
+PREVIEW_HANDLERS: dict[str, Callable[[Preview, Path, int], None]] = {
+    **dict.fromkeys(['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.ico', '.svg'], _preview_image),
+    **dict.fromkeys(['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v'], _preview_video),
+    **dict.fromkeys(['.mp3', '.wav', '.flac', '.ogg', '.m4a', '.aac', '.wma'], _preview_audio),
+    **dict.fromkeys(['.zip', '.tar', '.gz', '.bz2', '.xz', '.7z', '.rar'], _preview_archive),
+    '.pdf': _preview_pdf,
+    **dict.fromkeys(['.py', '.txt', '.md', '.json', '.yaml', '.toml', '.cpp', '.c',
+                     '.js', '.html', '.css', '.sh', '.rs', '.go', '.java', '.rb'], _preview_text),
+    **dict.fromkeys(['.exe', '.dll', '.so', '.dylib', '.app'], _preview_executable),
+    **dict.fromkeys(['.db', '.sqlite', '.sqlite3'], _preview_database),
+}
 
 
 class SearchPanel(RichLog):
@@ -272,8 +451,7 @@ class SearchPanel(RichLog):
             self.write(f"[yellow]No matches for '{query}'[/]")
         else:
             self.write(f"[green bold]Found {len(results)} matches:[/]\n")
-            for path in results[:150]:
-                self.write(f"📄 {path}")
+            self.write(self.highlighter(Text("\n".join(f"📄 {path}" for path in results[:150]))))
 
 
 # ==================== MAIN APP ====================
@@ -292,6 +470,8 @@ class FileExplorer(App):
     FileList {
         width: 40%;
         border: solid cyan;
+        background: $surface;
+        overflow-y: scroll;
     }
     
     Preview {
@@ -335,12 +515,18 @@ class FileExplorer(App):
         Binding("~", "go_home", "Home"),
     ]
     
+    # Lists the directories of one BFS level concurrently
+    search_executor = ThreadPoolExecutor(max_workers=32)
+    
     def __init__(self):
         super().__init__()
-        self.nav_stack = NavigationStack()
+        self.nav_stack: list[Path] = []  # Back navigation history
         self.search_active = False
         self.filter_active = False
         self.current_filter = ""
+        self._filter_applied = False  # File list currently shows filter results
+        self._search_timer: Optional[Timer] = None
+        self._search_cancel: Optional[threading.Event] = None  # Set to stop the running BFS
     
     def compose(self) -> ComposeResult:
         yield Header()
@@ -387,17 +573,15 @@ class FileExplorer(App):
         if self.search_active:
             return
         file_list = self.query_one(FileList)
-        file_list.selected_idx = 0
-        file_list.render_list()
+        file_list.select(0)
         self.update_preview()
     
     def action_bottom(self):
         if self.search_active:
             return
         file_list = self.query_one(FileList)
-        if file_list.files:
-            file_list.selected_idx = len(file_list.files) - 1
-            file_list.render_list()
+        if file_list.names:
+            file_list.select(len(file_list.names) - 1)
             self.update_preview()
     
     def action_enter(self):
@@ -406,25 +590,20 @@ class FileExplorer(App):
         file_list = self.query_one(FileList)
         selected = file_list.get_selected()
         if selected and selected.is_dir():
-            self.nav_stack.push(file_list.current_path)
-            file_list.load_directory(selected)
-            self.update_path_label()
-            self.update_preview()
+            self.open_directory(file_list, selected, history="push")
     
     def action_back(self):
         if self.search_active or self.filter_active:
             self.action_normal_mode()
             return
-        if not self.nav_stack.is_empty():
-            prev_path = self.nav_stack.pop()
-            self.query_one(FileList).load_directory(prev_path)
-            self.update_path_label()
-            self.update_preview()
+        if self.nav_stack:
+            self.open_directory(self.query_one(FileList), self.nav_stack[-1], history="pop")
     
     def action_toggle_hidden(self):
         """Toggle hidden files visibility"""
         if self.search_active or self.filter_active:
             return
+        self.cancel_navigation()
         file_list = self.query_one(FileList)
         file_list.toggle_hidden()
         self.update_path_label()
@@ -437,12 +616,40 @@ class FileExplorer(App):
         file_list = self.query_one(FileList)
         home = Path.home()
         if file_list.current_path != home:
-            self.nav_stack.push(file_list.current_path)
-            file_list.load_directory(home)
-            self.update_path_label()
-            self.update_preview()
+            self.open_directory(file_list, home, history="push")
+    
+    @work(thread=True, exclusive=True, group="navigation")
+    def open_directory(self, file_list: FileList, path: Path, history: str):
+        """Scan a directory off the UI thread, then swap it into the file list
+
+        history is "push" to record the current path, "pop" when going back.
+        """
+        worker = get_current_worker()
+        listing = file_list.scan_directory(path)
+        if not worker.is_cancelled:
+            self.call_from_thread(self.show_directory, worker, file_list, path, listing, history)
+    
+    def show_directory(self, worker: Worker, file_list: FileList, path: Path,
+                       listing: Listing, history: str):
+        # The worker may have been cancelled after it queued this call
+        if worker.is_cancelled:
+            return
+        # History changes only once the new listing lands, so repeated key
+        # presses during a slow scan (which supersede each other) count once
+        if history == "push":
+            self.nav_stack.append(file_list.current_path)
+        elif history == "pop":
+            self.nav_stack.pop()
+        file_list.show_listing(path, listing)
+        self.update_path_label()
+        self.update_preview()
+    
+    def cancel_navigation(self):
+        """Drop a pending directory load so it cannot replace the listing shown now"""
+        self.workers.cancel_group(self, "navigation")
     
     def action_search_mode(self):
+        self.cancel_navigation()
         self.search_active = True
         self.filter_active = False
         self.query_one(FileList).display = False
@@ -455,6 +662,7 @@ class FileExplorer(App):
     
     def action_filter_mode(self):
         """Filter current directory by extension"""
+        self.cancel_navigation()
         self.filter_active = True
         self.search_active = False
         search_box = self.query_one("#search-box", Input)
@@ -463,6 +671,8 @@ class FileExplorer(App):
         search_box.focus()
     
     def action_normal_mode(self):
+        self.cancel_navigation()
+        self.cancel_search()
         self.search_active = False
         self.filter_active = False
         self.current_filter = ""
@@ -472,8 +682,11 @@ class FileExplorer(App):
         search_box = self.query_one("#search-box", Input)
         search_box.display = False
         search_box.value = ""
-        # Reload without filter
-        self.query_one(FileList).load_directory(self.query_one(FileList).current_path)
+        # Reload without filter; search mode never touches the file list
+        if self._filter_applied:
+            file_list = self.query_one(FileList)
+            file_list.load_directory(file_list.current_path)
+            self._filter_applied = False
     
     def update_preview(self):
         file_list = self.query_one(FileList)
@@ -482,19 +695,25 @@ class FileExplorer(App):
             self.query_one(Preview).show_preview(selected)
     
     def on_input_changed(self, event: Input.Changed):
-        if self.search_active and len(event.value) >= 2:
-            self.set_timer(0.4, lambda: self.do_search(event.value))
+        if self.search_active:
+            # Debounce: only the last keystroke within 0.4s triggers a search,
+            # and a query shortened below 2 characters triggers none
+            self.stop_search_timer()
+            if len(event.value) >= 2:
+                self._search_timer = self.set_timer(0.4, lambda: self.do_search(event.value))
         elif self.filter_active:
             self.apply_filter(event.value)
     
     def apply_filter(self, filter_text: str):
         """Filter files in current directory"""
+        self.cancel_navigation()
         file_list = self.query_one(FileList)
         path = file_list.current_path
         filter_lower = filter_text.lower().strip()
         
         if not filter_lower:
             file_list.load_directory(path)
+            self._filter_applied = False
             return
         
         # Type-based filters
@@ -510,23 +729,22 @@ class FileExplorer(App):
         }
         
         try:
-            items = list(path.iterdir())
+            with os.scandir(path) as it:
+                items = list(it)
             
             # Check if it's a type filter
             if filter_lower in type_filters:
                 extensions = type_filters[filter_lower]
-                filtered = [i for i in items if i.suffix.lower() in extensions]
+                filtered = [i for i in items if os.path.splitext(i.name)[1].lower() in extensions]
             # Check if it's an extension filter
             elif filter_lower.startswith('.'):
-                filtered = [i for i in items if i.suffix.lower() == filter_lower]
+                filtered = [i for i in items if os.path.splitext(i.name)[1].lower() == filter_lower]
             # Name-based filter
             else:
                 filtered = [i for i in items if filter_lower in i.name.lower()]
             
-            filtered.sort(key=lambda x: (not x.is_dir(), x.name.lower()))
-            file_list.files = filtered[:300]
-            file_list.selected_idx = 0
-            file_list.render_list()
+            file_list.show_listing(path, file_list.build_listing(filtered), filtered=True)
+            self._filter_applied = True
             
         except (PermissionError, OSError):
             pass
@@ -534,33 +752,65 @@ class FileExplorer(App):
     def do_search(self, query: str):
         if not self.search_active:
             return
-        results = self.bfs_search(self.query_one(FileList).current_path, query.lower())
-        self.query_one(SearchPanel).show_results(results, query)
-    
-    def bfs_search(self, root: Path, query: str, max_results: int = 150) -> list[Path]:
-        """BFS search using Queue"""
-        search_queue = SearchQueue()
-        search_queue.enqueue(root)
+        self.cancel_search()
+        self._search_cancel = threading.Event()
+        self.search_files(self.query_one(FileList).current_path, query, self._search_cancel)
+    
+    def cancel_search(self):
+        """Stop a running BFS at its next directory"""
+        self.stop_search_timer()
+        # Cancelling a thread worker does not interrupt it, so bfs_search polls this event
+        if self._search_cancel is not None:
+            self._search_cancel.set()
+            self._search_cancel = None
+    
+    def stop_search_timer(self):
+        """Drop a debounced search that has not fired yet"""
+        if self._search_timer is not None:
+            self._search_timer.stop()
+            self._search_timer = None
+    
+    @work(thread=True, exclusive=True, group="search")
+    def search_files(self, root: Path, query: str, cancel: threading.Event):
+        """Run the BFS in a worker thread; a newer query cancels this one"""
+        results = self.bfs_search(root, query.lower(), cancel=cancel)
+        if not cancel.is_set():
+            self.call_from_thread(self.show_search_results, results, query)
+    
+    def show_search_results(self, results: list[Path], query: str):
+        if self.search_active:
+            self.query_one(SearchPanel).show_results(results, query)
+    
+    def bfs_search(self, root: Path, query: str, max_results: int = 150,
+                   cancel: Optional[threading.Event] = None) -> list[Path]:
+        """BFS search using a deque, listing each level's directories in parallel"""
+        cancel = cancel or threading.Event()
+        # The queue holds plain str paths; Path objects are only built for matches
+        search_queue = deque([os.fspath(root)])
         results = []
-        visited = set()
+        # Keyed on inode so symlinked or bind-mounted directories are listed once
+        visited: set[tuple[int, int]] = set()
         max_dirs = 300
         
-        while not search_queue.is_empty() and len(results) < max_results and len(visited) < max_dirs:
-            current = search_queue.dequeue()
-            
-            if current in visited:
-                continue
-            visited.add(current)
+        submitted = 0
+        
+        while search_queue and len(results) < max_results and submitted < max_dirs and not cancel.is_set():
+            # Take the current frontier, up to the directory budget, as one batch
+            level = []
+            while search_queue and submitted < max_dirs:
+                level.append(search_queue.popleft())
+                submitted += 1
             
-            try:
-                if current.is_dir():
-                    for item in current.iterdir():
-                        if query in item.name.lower():
-                            results.append(item)
-                        if item.is_dir():
-                            search_queue.enqueue(item)
-            except (PermissionError, OSError):
-                continue
+            # map() keeps BFS order while the listings (and their stat calls) run
+            # concurrently; leaving the loop early cancels those not yet started
+            for current, (key, dirnames, filenames) in zip(level, self.search_executor.map(_list_dir, level)):
+                if key is None or key in visited:
+                    continue
+                visited.add(key)
+                search_queue.extend(os.path.join(current, name) for name in dirnames)
+                results.extend(Path(current, name) for name in _matching(dirnames + filenames, query))
+                if len(results) >= max_results or cancel.is_set():
+                    break
         
         return results
 